@@ -1,4 +1,5 @@
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -10,6 +11,27 @@ SMTP_PORT = 587
 EMAIL = "shk6650@naver.com"       # 발신자 이메일
 PASSWORD = "PY6JMZXDS3Y4"          # 앱 비밀번호
 
+# 스레드별 SMTP 연결 재사용 — 발송마다 TLS 핸드셰이크/로그인 생략
+_local = threading.local()
+
+def _get_server():
+    server = getattr(_local, "server", None)
+    if server is not None:
+        try:
+            server.noop()  # 연결 생존 확인 (keep-alive)
+            return server
+        except Exception:
+            try:
+                server.quit()
+            except Exception:
+                pass
+            _local.server = None
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.starttls()
+    server.login(EMAIL, PASSWORD)
+    _local.server = server
+    return server
+
 def send_email(to_email, subject, body):
     """이메일 발송 함수"""
     try:
@@ -18,14 +40,16 @@ def send_email(to_email, subject, body):
         msg["To"] = to_email
         msg["Subject"] = subject
 
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(EMAIL, PASSWORD)
-        server.send_message(msg)
-        server.quit()
+        try:
+            _get_server().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # 유휴 타임아웃으로 끊긴 연결은 한 번 재접속 후 재시도
+            _local.server = None
+            _get_server().send_message(msg)
         print(f"✅ 이메일 전송 성공: {to_email}")
         return True
     except Exception as e:
         print("❌ 이메일 전송 실패:", e)
+        _local.server = None
         return False
-    
+
@@ -4,12 +4,22 @@ import re
 import html
 import time
 import uuid
+import asyncio
 import sqlite3
+import threading
+import collections
 from typing import List, Dict, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 
+import aiohttp
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import ahocorasick  # pyahocorasick — 키워드 일괄 매칭용 (C 확장, 없어도 동작)
+except ImportError:
+    ahocorasick = None
 from flask import Flask, render_template, request, redirect, url_for
 
 from my_email import send_email
@@ -19,13 +29,51 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 app = Flask(__name__, template_folder=TEMPLATES_DIR)
 
-RESULTS: Dict = {}
+class _LRUResults:
+    """최근 결과 N건만 유지하는 간단 LRU — 결과 dict의 무한 증식 방지."""
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._d: "collections.OrderedDict" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._d[key] = value
+            self._d.move_to_end(key)
+            while len(self._d) > self.maxsize:
+                self._d.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            val = self._d.get(key)
+            if val is not None:
+                self._d.move_to_end(key)
+            return val
+
+RESULTS = _LRUResults()
+
+# SMTP(STARTTLS+로그인+발송)를 응답 경로에서 떼어내는 백그라운드 발송 풀
+EMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# ── 공용 HTTP 세션 (keep-alive 재사용, ThreadPoolExecutor 워커 수에 맞춘 풀)
+UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+      "AppleWebKit/537.36 (KHTML, like Gecko) "
+      "Chrome/124.0.0.0 Safari/537.36")
+
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": UA})
+_adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
 
 # =========================================
 # theise.org 기업 테이블 크롤러
 # =========================================
 THEISE_URL = "https://www.theise.org/dome-company/"
 
+# 테이블 행만 읽으므로 <table> 서브트리만 파싱 (CPU/피크 메모리 절감)
+_ONLY_TABLES = SoupStrainer("table")
+
 THEISE_CAT_MAP = {
     "Integrated Device Manufacturer": ["Integrated Device Manufacturer", "IDM", "종합반도체"],
     "Foundry": ["Foundry", "파운드리"],
@@ -44,19 +92,73 @@ THEISE_CAT_MAP = {
     "해외기업(중국,유통)": ["해외기업(중국,유통)"],
 }
 
+# 별칭(소문자)→정식 라벨 역매핑을 임포트 시 1회 구축 — 호출당 O(1) 조회
+_ALIAS_TO_CANON = {a.lower(): k
+                   for k, aliases in THEISE_CAT_MAP.items()
+                   for a in aliases + [k]}
+
 def _normalize_cat(label: str) -> str:
     lab = (label or "").strip()
-    for k, aliases in THEISE_CAT_MAP.items():
-        if lab == k:
-            return k
-        if any(a.lower() == lab.lower() for a in aliases):
-            return k
-    return lab
+    return _ALIAS_TO_CANON.get(lab.lower(), lab)
+
+# 파싱 결과 메모리 캐시 — TTL 내에는 재검증 요청조차 생략
+_THEISE_ROWS_CACHE: Dict = {"rows": None, "ts": 0.0}
+_THEISE_TTL = 3600
+
+def _theise_cache_get() -> Tuple[Optional[str], Optional[str], Optional[bytes]]:
+    try:
+        with _CON_LOCK:
+            cur = _CON.execute("SELECT etag, last_modified, body FROM theise_cache WHERE id=1")
+            row = cur.fetchone()
+        return row if row else (None, None, None)
+    except Exception:
+        return (None, None, None)
+
+def _theise_cache_put(etag: Optional[str], last_modified: Optional[str], body: bytes):
+    try:
+        with _CON_LOCK:
+            _CON.execute(
+                "INSERT OR REPLACE INTO theise_cache(id, etag, last_modified, body, ts) "
+                "VALUES(1,?,?,?,?)",
+                (etag, last_modified, body, int(time.time()))
+            )
+    except Exception:
+        pass
 
 def fetch_theise_table() -> List[Dict]:
-    r = requests.get(THEISE_URL, timeout=20)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+    now = time.time()
+    if _THEISE_ROWS_CACHE["rows"] is not None and now - _THEISE_ROWS_CACHE["ts"] < _THEISE_TTL:
+        return _THEISE_ROWS_CACHE["rows"]
+
+    # 저장된 검증자가 있으면 조건부 요청 — 304면 본문 전송/재파싱 모두 생략 가능
+    etag, last_modified, stored_body = _theise_cache_get()
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    r = SESSION.get(THEISE_URL, timeout=20, headers=headers)
+    if r.status_code == 304 and (_THEISE_ROWS_CACHE["rows"] is not None or stored_body):
+        if _THEISE_ROWS_CACHE["rows"] is not None:
+            _THEISE_ROWS_CACHE["ts"] = now
+            return _THEISE_ROWS_CACHE["rows"]
+        body = stored_body
+    else:
+        r.raise_for_status()
+        body = r.content
+        _theise_cache_put(r.headers.get("ETag"), r.headers.get("Last-Modified"), body)
+
+    rows = _parse_theise_table(body)
+    _THEISE_ROWS_CACHE["rows"] = rows
+    _THEISE_ROWS_CACHE["ts"] = now
+    return rows
+
+def _parse_theise_table(content: bytes) -> List[Dict]:
+    # lxml(C) 파서 — html.parser 대비 5~10배 빠름.
+    # 필요한 건 <table>뿐이므로 head/본문 나머지는 파싱 자체를 생략.
+    # r.text 대신 바이트 + 명시 인코딩으로 chardet 문자셋 추정 비용 회피
+    soup = BeautifulSoup(content, "lxml", from_encoding="utf-8", parse_only=_ONLY_TABLES)
 
     rows: List[Dict] = []
     for table in soup.find_all("table"):
@@ -76,67 +178,173 @@ def fetch_theise_table() -> List[Dict]:
 # =========================================
 CACHE_DB = os.path.join(BASE_DIR, "address_cache.sqlite")
 
+# 모듈 수명 동안 재사용하는 단일 커넥션 (호출당 open/close + fsync 비용 제거)
+# ThreadPoolExecutor/이벤트루프 양쪽에서 쓰므로 락으로 직렬화
+_CON: Optional[sqlite3.Connection] = None
+_CON_LOCK = threading.Lock()
+
 def _ensure_cache():
+    global _CON
     os.makedirs(BASE_DIR, exist_ok=True)
-    with sqlite3.connect(CACHE_DB) as con:
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS addr_cache (
-                name TEXT PRIMARY KEY,
-                address TEXT,
-                ts INTEGER
-            )
-        """)
-        con.commit()
+    _CON = sqlite3.connect(CACHE_DB, check_same_thread=False, isolation_level=None)
+    _CON.execute("""
+        CREATE TABLE IF NOT EXISTS addr_cache (
+            name TEXT PRIMARY KEY,
+            address TEXT,
+            ts INTEGER
+        )
+    """)
+    # theise.org 응답 조건부 캐시 (검증자 + 원문 1건)
+    _CON.execute("""
+        CREATE TABLE IF NOT EXISTS theise_cache (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB,
+            ts INTEGER
+        )
+    """)
+    # WAL + NORMAL: 커밋당 fsync 비용 절감
+    _CON.execute("PRAGMA journal_mode=WAL")
+    _CON.execute("PRAGMA synchronous=NORMAL")
+    _CON.execute("PRAGMA temp_store=MEMORY")
+    _CON.execute("PRAGMA cache_size=-20000")
 
 _ensure_cache()
 
+# ts 컬럼을 TTL로 사용: 빈 결과(구글 미발견)는 하루 뒤, 히트는 7일 뒤 재조회
+NEG_CACHE_TTL = 86400
+POS_CACHE_TTL = 7 * 86400
+
+def _cache_row_fresh(address: str, ts: int, now: int) -> bool:
+    ttl = POS_CACHE_TTL if address else NEG_CACHE_TTL
+    return (now - (ts or 0)) < ttl
+
 def cache_get(name: str) -> Optional[str]:
+    """TTL이 지난 항목은 미스로 취급. 유효한 빈 문자열은 '최근 미발견'을 뜻함."""
     try:
-        with sqlite3.connect(CACHE_DB) as con:
-            cur = con.execute("SELECT address FROM addr_cache WHERE name=?", (name,))
+        with _CON_LOCK:
+            cur = _CON.execute("SELECT address, ts FROM addr_cache WHERE name=?", (name,))
             row = cur.fetchone()
-            return row[0] if row else None
+        if row and _cache_row_fresh(row[0], row[1], int(time.time())):
+            return row[0]
+        return None
     except Exception:
         return None
 
+def cache_get_many(names: List[str]) -> Dict[str, str]:
+    """이름 목록을 쿼리 한 번으로 일괄 조회. 캐시에 없거나 TTL 만료면 키 자체가 없음."""
+    names = [n for n in names if n]
+    if not names:
+        return {}
+    try:
+        with _CON_LOCK:
+            cur = _CON.execute(
+                f"SELECT name, address, ts FROM addr_cache WHERE name IN ({','.join('?' * len(names))})",
+                names,
+            )
+            rows = cur.fetchall()
+        now = int(time.time())
+        return {name: address for name, address, ts in rows
+                if _cache_row_fresh(address, ts, now)}
+    except Exception:
+        return {}
+
 def cache_put(name: str, address: str):
     try:
-        with sqlite3.connect(CACHE_DB) as con:
-            con.execute(
+        with _CON_LOCK:
+            _CON.execute(
                 "INSERT OR REPLACE INTO addr_cache(name, address, ts) VALUES(?,?,?)",
                 (name, address or "", int(time.time()))
             )
-            con.commit()
     except Exception:
         pass
 
+def cache_put_many(entries: List[Tuple[str, str]]):
+    """(name, address) 목록을 단일 트랜잭션으로 일괄 저장."""
+    if not entries:
+        return
+    try:
+        now = int(time.time())
+        with _CON_LOCK:
+            _CON.execute("BEGIN")
+            _CON.executemany(
+                "INSERT OR REPLACE INTO addr_cache(name, address, ts) VALUES(?,?,?)",
+                [(name, address or "", now) for name, address in entries],
+            )
+            _CON.execute("COMMIT")
+    except Exception:
+        try:
+            with _CON_LOCK:
+                _CON.execute("ROLLBACK")
+        except Exception:
+            pass
+
 # =========================================
 # 구글 주소 추출(지식패널/로컬) — 경량/조기종료
 # =========================================
-UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-      "AppleWebKit/537.36 (KHTML, like Gecko) "
-      "Chrome/124.0.0.0 Safari/537.36")
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
 
 def _txt(x: str) -> str:
     if not x:
         return ""
     x = html.unescape(x)
-    x = re.sub(r"<[^>]+>", " ", x)
-    x = re.sub(r"\s+", " ", x).strip()
+    x = _TAG_RE.sub(" ", x)
+    x = _WS_RE.sub(" ", x).strip()
     return x
 
-def _fetch(url, params=None, timeout=4.5):
-    return requests.get(url, params=params or {}, headers={"User-Agent": UA}, timeout=timeout)
+async def _fetch_async(session: "aiohttp.ClientSession", url, params=None, timeout=4.5):
+    """(status, 본문 바이트) 반환 — 문자셋 추정 없이 파서가 직접 디코딩하게 함."""
+    async with session.get(url, params=params or {},
+                           timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+        return r.status, await r.read()
+
+class _AsyncTokenBucket:
+    """
+    워커 전체가 공유하는 토큰버킷 속도 제한기.
+    고정 sleep과 달리 빠른 응답은 전역 상한(rate/초)까지 즉시 진행한다.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
 
 # 빠른 힌트: 이름만으로 '한국 주소일 가능성' 판단 → 지역 필터 없으면 구글 조회 스킵
 _BRANCH_NAME_HINTS = [
     r"\b코리아\b", r"\bKorea\b", r"\(.*Korea.*\)", r"^한국\s", r"㈜.*코리아"
 ]
-def quick_is_korea_name(name: str) -> bool:
-    n = name or ""
-    return any(re.search(pat, n, flags=re.IGNORECASE) for pat in _BRANCH_NAME_HINTS)
+# 패턴 5개를 하나로 합쳐 한 번의 C 레벨 스캔으로 판정
+_BRANCH_RE = re.compile("|".join(_BRANCH_NAME_HINTS), re.IGNORECASE)
 
-def get_company_address_from_google(name: str) -> str:
+def quick_is_korea_name(name: str) -> bool:
+    return bool(_BRANCH_RE.search(name or ""))
+
+# 지식패널 주소 + 보조 후보 셀렉터를 XPath 하나로 융합 (첫 매치만)
+_GOOGLE_ADDR_XPATH = (
+    '(//*[contains(@data-attrid, ":address")]'
+    ' | //span[contains(@class,"LrzXr")]'
+    ' | //div[contains(@class,"Io6YTe")]'
+    ' | //div[contains(@class,"wDYxhc")]/span)[1]'
+)
+
+async def get_company_address_from_google(session: "aiohttp.ClientSession",
+                                           sem: "asyncio.Semaphore",
+                                           rate: "_AsyncTokenBucket", name: str) -> str:
     if not name:
         return ""
     # 1) 캐시 우선
@@ -152,31 +360,26 @@ def get_company_address_from_google(name: str) -> str:
     address = ""
     for q in queries:
         try:
-            # 로컬(지도) 우선
-            r = _fetch("https://www.google.com/search", {"q": q, "hl": "ko", "tbm": "lcl"})
-            if r.status_code != 200 or not r.text:
+            # 로컬(지도) 우선 — 토큰버킷으로 전역 요청률, 세마포어로 동시요청 상한 유지
+            await rate.acquire()
+            async with sem:
+                status, body = await _fetch_async(
+                    session, "https://www.google.com/search",
+                    {"q": q, "hl": "ko", "tbm": "lcl"})
+            if status != 200 or not body:
                 continue
-            soup = BeautifulSoup(r.text, "html.parser")
-
-            node = soup.select_one('[data-attrid*=":address"]')
-            if node:
-                address = _txt(node.get_text(" ", strip=True))
-                if address:
-                    break
-
-            cand = soup.select_one("span.LrzXr, div.Io6YTe, div.wDYxhc span")
-            if cand:
-                address = _txt(cand.get_text(" ", strip=True))
+            # BeautifulSoup 래퍼 없이 lxml 트리 + XPath 1개로 DOM 1회 순회.
+            # 바이트를 그대로 넘겨 인코딩 처리도 lxml(C)이 1회 수행
+            tree = lxml.html.fromstring(body)
+            nodes = tree.xpath(_GOOGLE_ADDR_XPATH)
+            if nodes:
+                address = _txt(nodes[0].text_content())
                 if address:
                     break
         except Exception:
             pass
-        finally:
-            # 구글에 과도한 연속요청 방지
-            time.sleep(0.15)
 
-    # 3) 캐시에 저장
-    cache_put(name, address)
+    # 3) 캐시 저장은 호출측에서 일괄 처리 (cache_put_many)
     return address
 
 # =========================================
@@ -203,20 +406,50 @@ REGION_KEYWORDS = {
     "제주": ["제주", "Jeju"],
 }
 
+# 지역 키워드(~80개)를 오토마톤 하나로 합쳐 주소 문자열을 단일 패스로 스캔
+_REGION_AC = None
+if ahocorasick is not None:
+    _REGION_AC = ahocorasick.Automaton()
+    for _label, _keys in REGION_KEYWORDS.items():
+        for _k in _keys:
+            _REGION_AC.add_word(_k.lower(), _label)
+    _REGION_AC.make_automaton()
+
+# 오토마톤이 없을 때의 경로도 단일 정규식 1회 search로 — 그룹명은 한글 라벨을
+# 쓸 수 없으므로 r0, r1, ...으로 붙이고 역매핑으로 라벨 복원
+_REGION_GROUP_TO_LABEL: Dict[str, str] = {}
+_parts = []
+for _i, (_label, _keys) in enumerate(REGION_KEYWORDS.items()):
+    _group = f"r{_i}"
+    _REGION_GROUP_TO_LABEL[_group] = _label
+    _parts.append("(?P<%s>%s)" % (_group, "|".join(re.escape(_k.lower()) for _k in _keys)))
+_REGION_RE = re.compile("|".join(_parts))
+
+def _normalize_region_from_lc(addr_lc: str) -> str:
+    """이미 소문자화된 주소 전용 — 호출측이 .lower()를 1회만 수행하도록 분리."""
+    if not addr_lc:
+        return ""
+    if _REGION_AC is not None:
+        for _, label in _REGION_AC.iter(addr_lc):
+            return label
+        return ""
+    m = _REGION_RE.search(addr_lc)
+    return _REGION_GROUP_TO_LABEL[m.lastgroup] if m else ""
+
 def normalize_region_from_address(addr: str) -> str:
-    a = (addr or "").lower()
-    for label, keys in REGION_KEYWORDS.items():
-        for k in keys:
-            if k.lower() in a:
-                return label
-    return ""
-
-def is_korea_address(addr: str) -> bool:
+    return _normalize_region_from_lc((addr or "").lower())
+
+# 입력을 이미 소문자화하므로 IGNORECASE 불필요 (케이스폴딩 없는 매칭이 더 빠름)
+_KOREA_RE = re.compile(r"\b(korea|republic of korea|대한민국)\b")
+
+def is_korea_address(addr: str, addr_lc: Optional[str] = None) -> bool:
     if not addr:
         return False
-    if normalize_region_from_address(addr):
+    if addr_lc is None:
+        addr_lc = addr.lower()
+    if _normalize_region_from_lc(addr_lc):
         return True
-    if re.search(r"\b(Korea|Republic of Korea|대한민국)\b", addr, re.IGNORECASE):
+    if _KOREA_RE.search(addr_lc):
         return True
     return False
 
@@ -227,24 +460,31 @@ def is_foreign_branch_in_korea(company_name: str, address: str) -> bool:
 # =========================================
 # 필터 & 결과 구성 (병렬 주소 조회 + 캐시)
 # =========================================
-def _resolve_address_for_item(item: Dict, do_lookup: bool) -> Tuple[str, str, bool]:
+def _resolve_address_for_item(item: Dict) -> Tuple[str, str, bool]:
     """
+    주소 조회 없이 캐시/이름 힌트만으로 빠르게 판정.
     반환: (region_final, address, branch_kr)
     """
     name = item["name"]
-
-    # 주소 조회 스킵 조건일 땐 힌트 기반 빠른 판정만
-    if not do_lookup:
-        addr = cache_get(name) or ""
-        if not addr and quick_is_korea_name(name):
-            # 힌트로 한국소속만 대충 표시 (정확지역 미상)
-            return ("서울" if "서울" in name else "", "", True)  # 지역라벨은 공란(또는 임의로 서울 추정 X)
-        return ("", addr or "", False)
-
-    # 실제 조회
-    addr = get_company_address_from_google(name)
-    if is_korea_address(addr):
-        region_label = normalize_region_from_address(addr)
+    addr = cache_get(name) or ""
+    if not addr and quick_is_korea_name(name):
+        # 힌트로 한국소속만 대충 표시 (정확지역 미상)
+        return ("서울" if "서울" in name else "", "", True)  # 지역라벨은 공란(또는 임의로 서울 추정 X)
+    return ("", addr or "", False)
+
+async def _resolve_address_for_item_async(session: "aiohttp.ClientSession",
+                                          sem: "asyncio.Semaphore",
+                                          rate: "_AsyncTokenBucket",
+                                          item: Dict) -> Tuple[str, str, bool]:
+    """
+    실제 구글 조회 포함 판정.
+    반환: (region_final, address, branch_kr)
+    """
+    name = item["name"]
+    addr = await get_company_address_from_google(session, sem, rate, name)
+    addr_lc = addr.lower()
+    if is_korea_address(addr, addr_lc):
+        region_label = _normalize_region_from_lc(addr_lc)
         region_final = region_label if region_label else "서울" if "Seoul" in addr else ""  # 지역 미상은 공란
     else:
         region_final = "해외"
@@ -252,6 +492,27 @@ def _resolve_address_for_item(item: Dict, do_lookup: bool) -> Tuple[str, str, bo
     branch_kr = is_foreign_branch_in_korea(name, addr)
     return (region_final, addr, branch_kr)
 
+async def _resolve_addresses_async(items: List[Dict]) -> Dict[str, Tuple[str, str, bool]]:
+    """이벤트 루프 하나에서 전체 구글 조회를 동시 수행."""
+    results: Dict[str, Tuple[str, str, bool]] = {}
+    sem = asyncio.Semaphore(8)
+    rate = _AsyncTokenBucket(rate=8)  # 초당 8요청 — 기존 0.15s/워커 sleep과 비슷한 총량
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector,
+                                     headers={"User-Agent": UA}) as session:
+        async def one(item: Dict):
+            try:
+                triple = await _resolve_address_for_item_async(session, sem, rate, item)
+            except Exception:
+                triple = ("", "", False)
+            results[item["name"]] = triple
+
+        await asyncio.gather(*(one(r) for r in items))
+
+    # 조회 결과를 단일 트랜잭션으로 일괄 캐시
+    cache_put_many([(name, addr) for name, (_, addr, _) in results.items()])
+    return results
+
 def filter_and_enrich(rows: List[Dict], pick_types: List[str], per_type: int,
                       filter_regions: List[str], only_foreign_branch: bool = False) -> List[Dict]:
     wants = set(_normalize_cat(t) for t in (pick_types or []))
@@ -268,7 +529,14 @@ def filter_and_enrich(rows: List[Dict], pick_types: List[str], per_type: int,
     # 주소 조회가 반드시 필요한지 판단
     need_address_lookup = bool(regions_set) or only_foreign_branch
 
-    # 유형별 처리
+    # 1단계: 유형별 중복 제거 + 캐시 선반영, 실제 조회 대상은 전역 수집
+    per_type_prebuilt: Dict[str, List[Tuple[Dict, Tuple[str, str, bool]]]] = {}
+    per_type_to_resolve: Dict[str, List[Dict]] = {}
+    name_to_triple: Dict[str, Tuple[str, str, bool]] = {}  # 유형 간 공유 판정 결과
+
+    # 행당 커넥션 대신 전역 1회 일괄 캐시 조회
+    cache_map = cache_get_many([r["name"] for arr in grouped.values() for r in arr])
+
     for t, arr in grouped.items():
         # 중복 회사명 제거 (상위에 동일행이 많은 경우 속도 향상)
         seen = set()
@@ -285,86 +553,127 @@ def filter_and_enrich(rows: List[Dict], pick_types: List[str], per_type: int,
 
         for r in uniq:
             name = r["name"]
-            cached = cache_get(name)
-            if cached is not None and (not need_address_lookup or cached):
-                # 캐시를 기반으로 빠르게 판정
-                addr = cached
-                if is_korea_address(addr):
-                    reg_lab = normalize_region_from_address(addr)
-                    reg_final = reg_lab if reg_lab else ""
-                else:
-                    reg_final = "해외" if addr else ""
-                branch_kr = is_foreign_branch_in_korea(name, addr)
-                prebuilt.append((r, (reg_final, addr, branch_kr)))
+            cached = cache_map.get(name)
+            # TTL 검증은 cache_get_many가 수행 — 유효한 빈 값(최근 미발견)도
+            # 재조회하지 않고 그대로 신뢰해 반복 구글 요청을 막음
+            if cached is not None:
+                # 캐시를 기반으로 빠르게 판정 — 여러 유형에 중복된 이름은 1회만 계산
+                triple = name_to_triple.get(name)
+                if triple is None:
+                    addr = cached
+                    addr_lc = addr.lower()
+                    if is_korea_address(addr, addr_lc):
+                        reg_lab = _normalize_region_from_lc(addr_lc)
+                        reg_final = reg_lab if reg_lab else ""
+                    else:
+                        reg_final = "해외" if addr else ""
+                    branch_kr = is_foreign_branch_in_korea(name, addr)
+                    triple = (reg_final, addr, branch_kr)
+                    name_to_triple[name] = triple
+                prebuilt.append((r, triple))
             else:
                 to_resolve.append(r)
 
-        # 병렬 주소 조회
-        results_map: Dict[str, Tuple[str, str, bool]] = {}
-        if to_resolve and need_address_lookup:
-            with ThreadPoolExecutor(max_workers=min(8, max(2, os.cpu_count() or 4))) as ex:
-                futs = {ex.submit(_resolve_address_for_item, r, True): r for r in to_resolve}
-                for fut in as_completed(futs):
-                    r = futs[fut]
-                    try:
-                        region_final, addr, branch_kr = fut.result()
-                    except Exception:
-                        region_final, addr, branch_kr = ("", "", False)
-                    results_map[r["name"]] = (region_final, addr, branch_kr)
-
+        per_type_prebuilt[t] = prebuilt
+        per_type_to_resolve[t] = to_resolve
+
+    # 라벨을 못 뽑은 주소의 원문 스캔용 — 요청당 1회 컴파일, C 레벨 단일 스캔
+    region_fallback_re = (re.compile("|".join(re.escape(reg) for reg in regions_set))
+                          if regions_set else None)
+
+    def accept_region(region_final: str, addr: str) -> bool:
+        if not regions_set:
+            return True
+        # 해외 선택 시
+        if region_final == "해외":
+            return "해외" in regions_set
+        # 국내 라벨 선택 시
+        if region_final and region_final in regions_set:
+            return True
+        # 라벨을 못 뽑았으면 주소문자열에 지역 단서라도 있는지
+        return bool(region_fallback_re.search(addr or ""))
+
+    def _build_row(t: str, r: Dict, triple: Tuple[str, str, bool]) -> Optional[Dict]:
+        """필터 통과 시 결과 행, 탈락 시 None."""
+        region_final, addr, branch_kr = triple
+        if only_foreign_branch and not branch_kr:
+            return None
+        if not accept_region(region_final, addr):
+            return None
+        return {
+            "회사 유형": t,
+            "회사명": r["name"],
+            "지역": region_final or ("해외" if (addr and not is_korea_address(addr)) else ""),
+            "주소(구글)": addr,
+            "지사구분": "외국계 지사(한국)" if branch_kr else "",
+            "링크": r["url"],
+        }
+
+    # 2단계: 유형별 상한을 먼저 적용 — cap을 채우는 데 필요한 만큼만 구글 조회
+    cap = max(1, per_type)
+    results_map: Dict[str, Tuple[str, str, bool]] = {}
+    enriched_by_type: Dict[str, List[Dict]] = {t: [] for t in grouped}
+    cursor: Dict[str, int] = {t: 0 for t in grouped}  # to_resolve 소비 위치
+
+    # 캐시 선반영분 먼저 수용 (네트워크 비용 0)
+    for t in grouped:
+        acc = enriched_by_type[t]
+        for r, triple in per_type_prebuilt[t]:
+            if len(acc) >= cap:
+                break
+            row = _build_row(t, r, triple)
+            if row:
+                acc.append(row)
+
+    if not need_address_lookup:
         # 조회가 꼭 필요 없으면 (필터X) 힌트 기반으로만 빠르게 채우기
-        if to_resolve and not need_address_lookup:
-            for r in to_resolve:
-                results_map[r["name"]] = _resolve_address_for_item(r, False)
-
-        # 합치기
-        enriched: List[Dict] = []
-        def accept_region(region_final: str, addr: str) -> bool:
-            if not regions_set:
-                return True
-            # 해외 선택 시
-            if region_final == "해외":
-                return "해외" in regions_set
-            # 국내 라벨 선택 시
-            if region_final and region_final in regions_set:
-                return True
-            # 라벨을 못 뽑았으면 주소문자열에 지역 단서라도 있는지
-            return any(reg in (addr or "") for reg in regions_set)
-
-        # 캐시/사전 구성분
-        for r, triple in prebuilt:
-            region_final, addr, branch_kr = triple
-            if only_foreign_branch and not branch_kr:
-                continue
-            if not accept_region(region_final, addr):
-                continue
-            enriched.append({
-                "회사 유형": t,
-                "회사명": r["name"],
-                "지역": region_final or ("해외" if (addr and not is_korea_address(addr)) else ""),
-                "주소(구글)": addr,
-                "지사구분": "외국계 지사(한국)" if branch_kr else "",
-                "링크": r["url"],
-            })
-
-        # 새로 조회된 것들
-        for r in to_resolve:
-            region_final, addr, branch_kr = results_map.get(r["name"], ("", "", False))
-            if only_foreign_branch and not branch_kr:
-                continue
-            if not accept_region(region_final, addr):
-                continue
-            enriched.append({
-                "회사 유형": t,
-                "회사명": r["name"],
-                "지역": region_final or ("해외" if (addr and not is_korea_address(addr)) else ""),
-                "주소(구글)": addr,
-                "지사구분": "외국계 지사(한국)" if branch_kr else "",
-                "링크": r["url"],
-            })
-
-        # 유형별 상한 적용
-        out.extend(enriched[:max(1, per_type)])
+        for t in grouped:
+            acc = enriched_by_type[t]
+            for r in per_type_to_resolve[t]:
+                if len(acc) >= cap:
+                    break
+                nm = r["name"]
+                if nm not in results_map:
+                    results_map[nm] = _resolve_address_for_item(r)
+                row = _build_row(t, r, results_map[nm])
+                if row:
+                    acc.append(row)
+    else:
+        # 웨이브 방식: 상한이 덜 찬 유형의 다음 후보만 모아 일괄 조회.
+        # 이름은 전역 공유되므로 한 번 조회된 회사는 모든 유형이 재사용
+        while True:
+            wave_items: Dict[str, Dict] = {}
+            for t in grouped:
+                acc = enriched_by_type[t]
+                to_resolve = per_type_to_resolve[t]
+                idx = cursor[t]
+                # 이미 해석된 후보부터 소진
+                while idx < len(to_resolve) and len(acc) < cap:
+                    nm = to_resolve[idx]["name"]
+                    if nm not in results_map:
+                        break
+                    row = _build_row(t, to_resolve[idx], results_map[nm])
+                    if row:
+                        acc.append(row)
+                    idx += 1
+                cursor[t] = idx
+                # 부족분만큼 다음 미해석 후보를 웨이브에 등록 (전역 중복 제거)
+                need = cap - len(acc)
+                j = idx
+                while j < len(to_resolve) and need > 0:
+                    nm = to_resolve[j]["name"]
+                    if nm in wave_items:
+                        need -= 1
+                    elif nm not in results_map:
+                        wave_items[nm] = to_resolve[j]
+                        need -= 1
+                    j += 1
+            if not wave_items:
+                break
+            results_map.update(asyncio.run(_resolve_addresses_async(list(wave_items.values()))))
+
+    for t in grouped:
+        out.extend(enriched_by_type[t][:cap])
 
     return out
 
@@ -398,27 +707,22 @@ def company_search():
     except Exception as e:
         error_msg = f"조회 실패: {e}"
         if recipient_email:
-            send_email(recipient_email, "🔎 기업정보 검색 결과 - 실패", error_msg)
+            EMAIL_EXECUTOR.submit(send_email, recipient_email, "🔎 기업정보 검색 결과 - 실패", error_msg)
         return render_template("main.html", error=error_msg)
 
-    # 이메일 본문 생성 (결과 없을 때도 발송)
+    # 이메일 본문 생성 (결과 없을 때도 발송) — 중간 리스트 없이 제너레이터로 join
     if rows:
-        body_lines = ["기업정보 검색 결과:\n"]
-        for r in rows:
-            body_lines.append(
-                f"{r['회사명']} ({r['회사 유형']})\n지역: {r['지역']}\n주소: {r['주소(구글)']}\n링크: {r['링크']}\n"
-            )
+        body = "기업정보 검색 결과:\n\n" + "\n".join(
+            f"{r['회사명']} ({r['회사 유형']})\n지역: {r['지역']}\n주소: {r['주소(구글)']}\n링크: {r['링크']}\n"
+            for r in rows
+        )
     else:
-        body_lines = ["조건에 해당하는 기업 정보가 없습니다. 유형/지역 조건을 조정해보세요."]
-    
-    body = "\n".join(body_lines)
+        body = "조건에 해당하는 기업 정보가 없습니다. 유형/지역 조건을 조정해보세요."
 
-    # 이메일 발송
+    # 이메일 발송 — SMTP 왕복을 기다리지 않고 즉시 리다이렉트
+    # (성공/실패 로그는 send_email이 출력)
     if recipient_email:
-        success = send_email(recipient_email, "🔎 기업정보 검색 결과", body)
-        if not success:
-            print(f"⚠️ 이메일 발송 실패: {recipient_email}")
-
+        EMAIL_EXECUTOR.submit(send_email, recipient_email, "🔎 기업정보 검색 결과", body)
 
     # 결과 페이지용 저장
     job_id = uuid.uuid4().hex
@@ -442,5 +746,6 @@ def result_page(job_id):
     return render_template("results.html", **payload)
 
 if __name__ == "__main__":
-    # pip install flask requests beautifulsoup4
+    # pip install flask requests aiohttp beautifulsoup4 lxml
+    # (선택) pip install pyahocorasick — 지역 키워드 매칭 가속
     app.run(debug=True, host="0.0.0.0", port=5002)